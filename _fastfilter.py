@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: ascii -*-
+"""Hot-path string helpers for pylaunchd_gui.
+
+Plain Python with full type annotations so the module can optionally be
+compiled to a C extension with mypyc (`pip3 install mypy && mypyc _fastfilter.py`)
+to strip the interpreter dispatch overhead from the filter and parse loops;
+the compiled module shadows this file and the GUI picks it up unchanged.
+"""
+
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+
+def build_search_index(data_lower: List[Tuple[str, str]]) -> Tuple[str, List[int]]:
+    """Concatenate the lowercase label/path columns into one searchable blob
+    plus a row-offset table mapping match positions back to row numbers.
+    """
+    parts: List[str] = []
+    offsets: List[int] = []
+    pos = 0
+    for label, path in data_lower:
+        offsets.append(pos)
+        entry = f'{label}\t{path}\n'
+        parts.append(entry)
+        pos += len(entry)
+    offsets.append(pos)
+    return ''.join(parts), offsets
+
+
+def filter_rows(blob: str, offsets: List[int], needle: str) -> List[int]:
+    """Indices of the rows whose blob entry contains needle.
+
+    One C-level str.find scan over the whole corpus instead of a Python loop
+    with two substring tests per row; after a hit the scan resumes at the next
+    row, so each row is reported at most once and in order.
+    """
+    matches: List[int] = []
+    last = len(offsets) - 1
+    pos = blob.find(needle)
+    while pos != -1:
+        row = bisect_right(offsets, pos) - 1
+        matches.append(row)
+        if row + 1 >= last:
+            break
+        pos = blob.find(needle, offsets[row + 1])
+    return matches
+
+
+def extract_path_state(details: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Single pass over a `launchctl print` dump for the path and state lines.
+
+    The keys are fixed literals, so a C-level startswith per line beats
+    regex-scanning the whole multi-KB dump twice.
+    """
+    path: Optional[str] = None
+    state: Optional[str] = None
+    for line in details.splitlines():
+        s = line.lstrip()
+        if path is None and s.startswith(b'path = '):
+            path = s[7:].decode('utf-8', 'replace')
+        elif state is None and s.startswith(b'state = '):
+            state = s[8:].decode('utf-8', 'replace')
+        if path is not None and state is not None:
+            break
+    return path, state
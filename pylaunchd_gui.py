@@ -1,17 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: ascii -*-
-import operator
+import asyncio
+import difflib
 import os
 import re
+import shlex
 import subprocess
 import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 # import launchd
+import qasync
+from _fastfilter import build_search_index, extract_path_state, filter_rows
 from PyQt5 import QtCore
 from PyQt5 import QtGui
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import QLineEdit
+from qasync import asyncSlot
 
 """
 
@@ -95,6 +102,88 @@ DEFAULT_EDITOR = 'system'
 
 DEBUG = False
 
+# per-label `launchctl print` output cache: repeated refreshes within the TTL
+# skip the subprocess entirely
+_PRINT_CACHE_TTL = 60  # seconds
+_PRINT_CACHE_MAX = 2048  # entries
+
+# launchctl output is parsed as bytes; only the captured groups get decoded
+# one `services = {` block line: pid, state, label
+_SVC_LINE_RE = re.compile(rb'^\s*\S+\s+\S+\s+(\S+)\s*$', re.MULTILINE)
+
+# long-lived shell helper: one fork/exec total instead of one per command;
+# each reply ends with a sentinel line carrying the command's exit status
+_HELPER_SENTINEL = b'---pylaunchd-exec-done---'
+_HELPER_SCRIPT = ('while IFS= read -r line; do eval "$line" 2>&1; '
+                  f'printf "\\n%s%s\\n" "{_HELPER_SENTINEL.decode()}" "$?"; done')
+
+
+def _parse_dumpstate(dump):
+    """Split a `launchctl dumpstate` dump into raw per-service blocks keyed by
+    their full `<domain>/<label>` name.
+
+    Service entries open with `<domain>/<label> = {` at the outermost level and
+    close on the matching brace; other top-level blocks (the domain summaries)
+    carry no '/' in their name and are skipped. The domain stays in the key
+    because the same label can be loaded in several domains at once.
+    """
+    blocks = {}
+    name = None
+    chunk = []
+    depth = 0
+    for line in dump.splitlines(keepends=True):
+        if depth == 0:
+            stripped = line.strip()
+            if stripped.endswith(b'= {'):
+                entry = stripped[:-3].strip()
+                name = entry.decode('utf-8', 'replace') if b'/' in entry else None
+                chunk = [line]
+                depth = 1
+        else:
+            chunk.append(line)
+            depth += line.count(b'{') - line.count(b'}')
+            if depth <= 0:
+                if name is not None:
+                    blocks[name] = b''.join(chunk)
+                name = None
+                depth = 0
+    return blocks
+
+
+def _raise_qos():
+    """Escape the Background QoS class inherited when the app itself was started
+    by launchd (e.g. as a LoginItem), which throttles CPU/IO for the process and
+    for every launchctl child it spawns.
+    """
+    if sys.platform == 'darwin':
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            QOS_CLASS_USER_INITIATED = 0x19
+            if libc.pthread_set_qos_class_self_np(QOS_CLASS_USER_INITIATED, 0) == 0:
+                return
+        except (OSError, AttributeError):
+            pass
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, -5)
+    except (OSError, AttributeError):
+        # raising priority needs privileges; keep the inherited level
+        pass
+
+
+def _run(args):
+    """Run a command and return its raw (stdout, stderr) bytes; safe to call off the GUI thread.
+
+    close_fds=False is safe for these short-lived read-only children and lets
+    CPython take the posix_spawn fast path instead of walking the FD table
+    before every exec.
+    """
+    if DEBUG:
+        print(f'CMD: {" ".join(args)}')
+
+    result = subprocess.run(args, capture_output=True, close_fds=False)
+    return result.stdout, result.stderr
+
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -110,14 +199,29 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setGeometry(100, 150, 500, 660)
 
         self.jobs = {}
+        # (domain, uid, label) -> (monotonic timestamp, `launchctl print` output), LRU-ordered
+        self._print_cache = OrderedDict()
+        # spawned lazily by _helper_exec, closed in closeEvent
+        self._helper = None
         self.createActions()
         self.createMenus()
         self.createToolBars()
         # TODO: get id from saved settings (INI file)
-        self.data = self.load_data_launchctl(self.domain_id)
-        self.data_all = []
-        self.data_all[:] = self.data
-        self.statusBar().showMessage(f'Total jobs: {len(self.data)}')
+        # column-major job table, filled asynchronously once the event loop is
+        # running (see main()); the model maps visible rows onto these arrays
+        self.labels = []
+        self.paths = []
+        self.states = []
+        # lowercase label/path columns concatenated into one blob per load so
+        # each keystroke is a single C-level scan instead of a per-row loop
+        self._search_blob = ''
+        self._search_offsets = [0]
+        # coalesce bursts of keystrokes into a single filter + model reset
+        self._pending_search = ''
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search)
 
         self.textEdit = QtWidgets.QTextEdit()
         self.textEdit.setReadOnly(True)
@@ -135,23 +239,89 @@ class MainWindow(QtWidgets.QMainWindow):
             self.actionToggleToolbar.setChecked(True)
             self.on_toggle_toolbar()
 
+    def _helper_exec(self, args):
+        """Run a command through the long-lived shell helper over a pipe,
+        skipping the per-call fork+exec+dyld cost; returns (merged
+        stdout+stderr, exit status).
+        """
+        if self._helper is None or self._helper.poll() is not None:
+            self._helper = subprocess.Popen(
+                ['/bin/sh', '-c', _HELPER_SCRIPT],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                bufsize=0, close_fds=False)
+
+        command = ' '.join(shlex.quote(arg) for arg in args)
+        if DEBUG:
+            print(f'CMD (helper): {command}')
+        self._helper.stdin.write(command.encode() + b'\n')
+        self._helper.stdin.flush()
+
+        buf = bytearray()
+        while True:
+            line = self._helper.stdout.readline()
+            if not line:
+                raise BrokenPipeError('command helper exited')
+            if line.startswith(_HELPER_SENTINEL):
+                status = int(line[len(_HELPER_SENTINEL):] or 0)
+                break
+            buf += line
+        # drop the newline the sentinel printf prepends
+        if buf.endswith(b'\n'):
+            del buf[-1:]
+        return bytes(buf), status
+
     def exec(self, args):
+        try:
+            out, status = self._helper_exec(args)
+        except (OSError, ValueError):
+            # helper died mid-command; fall back to a one-shot spawn
+            out, err = _run(args)
+            if err:
+                show_gui_error(str(args), err.decode('utf-8', 'replace'))
+            return out
+        if status != 0:
+            show_gui_error(str(args), out.decode('utf-8', 'replace'))
+            return b''
+        return out
+
+    async def exec_async(self, args):
+        """Run a command on the asyncio loop and return its raw (stdout, stderr) bytes."""
         if DEBUG:
             print(f'CMD: {" ".join(args)}')
 
-        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = process.communicate()
-        result = out.decode('utf-8')
-        if err:
-            show_gui_error(str(args), err.decode('utf-8'))
-        return result
-
-    def initialize_data(self, idx=0):
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=False)
+        out, err = await process.communicate()
+        return out, err
+
+    async def _print_cached(self, key, args):
+        """exec_async with a bounded LRU cache so repeated refreshes skip the subprocess."""
+        cached = self._print_cache.get(key)
+        if cached is not None:
+            timestamp, out = cached
+            if time.monotonic() - timestamp < _PRINT_CACHE_TTL:
+                self._print_cache.move_to_end(key)
+                return out, b''
+        out, err = await self.exec_async(args)
+        if not err:
+            self._print_cache[key] = (time.monotonic(), out)
+            self._print_cache.move_to_end(key)
+            while len(self._print_cache) > _PRINT_CACHE_MAX:
+                self._print_cache.popitem(last=False)
+        return out, err
+
+    def _invalidate_print_cache(self, label):
+        # the dumpstate snapshot covers every label, so it goes stale too
+        for key in [key for key in self._print_cache
+                    if key[-1] == label or key[0] == 'dumpstate']:
+            del self._print_cache[key]
+
+    async def initialize_data(self, idx=0):
         try:
-            self.tableView.tableModel.sendSignalLayoutAboutToBeChanged()
-            self.data[:] = self.load_data_launchctl(idx)
-            self.data_all[:] = self.data
-            self.tableView.tableModel.sendSignalLayoutChanged()
+            labels, paths, states, data_lower = await self.load_data_launchctl(idx)
+            self.labels, self.paths, self.states = labels, paths, states
+            self._search_blob, self._search_offsets = build_search_index(data_lower)
+            self.tableView.tableModel.replace_columns(labels, paths, states)
         except Exception as e:
             print("Error initializing data", e)
 
@@ -168,13 +338,15 @@ class MainWindow(QtWidgets.QMainWindow):
         selected_indexes = self.tableView.selectionModel().selectedRows()
 
         if len(selected_indexes):
-            idx = selected_indexes[0].row()
-            label = self.data[idx][0]
-            plist_path = self.data[idx][1]
+            source = self.tableView.tableModel.source_row(selected_indexes[0].row())
+            label = self.labels[source]
+            plist_path = self.paths[source]
+            # start/stop/enable/disable mutate job state, so drop any cached print output
+            self._invalidate_print_cache(label)
             full_args = args + [plist_path]
             result = self.exec(full_args)
             if result:
-                self.statusBar().showMessage(f'{result}\nargs:\n {full_args}')
+                self.statusBar().showMessage(f'{result.decode("utf-8", "replace")}\nargs:\n {full_args}')
         else:
             show_gui_error("Please select a job first!")
 
@@ -195,22 +367,24 @@ class MainWindow(QtWidgets.QMainWindow):
         selected_indexes = self.tableView.selectionModel().selectedRows()
 
         if len(selected_indexes):
-            idx = selected_indexes[0].row()
-            path = self.data[idx][1]
+            source = self.tableView.tableModel.source_row(selected_indexes[0].row())
+            path = self.paths[source]
             result = self.exec(['open', '-R', path])
             if result:
-                self.statusBar().showMessage(result)
+                self.statusBar().showMessage(result.decode('utf-8', 'replace'))
         else:
             show_gui_error("Please select a job first!")
 
-    def on_refresh(self, which):
+    @asyncSlot()
+    async def on_refresh(self, which=None):
         domain_index = self.comboBoxDomain.currentIndex()
         self.statusBar().showMessage(f'Refreshing domain {LAUNCHD_DOMAINS[domain_index]} - please wait...')
-        self.initialize_data(domain_index)
-        self.statusBar().showMessage(f'Total jobs: {len(self.data)}')
+        await self.initialize_data(domain_index)
+        self.statusBar().showMessage(f'Total jobs: {len(self.labels)}')
 
         if self.searchBox.text():
-            self.on_search_changed(self.searchBox.text())
+            self._pending_search = self.searchBox.text()
+            self._apply_search()
 
     def createActions(self):
 
@@ -297,27 +471,32 @@ class MainWindow(QtWidgets.QMainWindow):
             self.editor = value
             self.statusBar().showMessage(f'Editor="{self.editor}"')
 
-    def on_domain_changed(self, selected_index):
+    @asyncSlot(int)
+    async def on_domain_changed(self, selected_index):
         # self.load_data_launchctl(selected_index)
         self.domain_id = selected_index
         self.statusBar().showMessage(f'Loading jobs for domain [{LAUNCHD_DOMAINS[selected_index]}] - please wait...')
-        self.initialize_data(selected_index)
-        self.statusBar().showMessage(f'Total jobs: {len(self.data)}')
-        # self.data = self.load_data_launchctl(selected_index)[:]
+        await self.initialize_data(selected_index)
+        self.statusBar().showMessage(f'Total jobs: {len(self.labels)}')
 
     def on_search_changed(self, text):
+        self._pending_search = text
+        self._search_timer.start()
+
+    def _apply_search(self):
+        text = self._pending_search
 
         if text:
             self.statusBar().showMessage(f'Filter by: {text}')
 
         try:
-            self.tableView.tableModel.sendSignalLayoutAboutToBeChanged()
-            if text:
-                filtered_data = [d for d in self.data_all if text.lower() in d[0].lower() or text in d[1].lower()]
+            t = text.lower()
+            if t:
+                indices = filter_rows(self._search_blob, self._search_offsets, t)
             else:
-                filtered_data = self.data_all
-            self.data[:] = filtered_data
-            self.tableView.tableModel.sendSignalLayoutChanged()
+                # range supports the slicing set_visible needs, no list copy
+                indices = range(len(self.labels))
+            self.tableView.tableModel.set_visible(indices)
         except Exception as e:
             self.statusBar().showMessage(str(e))
             print("Error initializing data", e)
@@ -356,35 +535,54 @@ class MainWindow(QtWidgets.QMainWindow):
         self.searchBox.textChanged.connect(self.on_search_changed)
         self.toolBar.addWidget(self.searchBox)
 
-    def load_data_launchctl(self, domain_id=0):
-        data = []
+    def _domain_spec(self, domain_id=None):
+        """launchctl domain specifier for the given domain, e.g. 'gui/501' or 'system'."""
+        if domain_id is None:
+            domain_id = self.domain_id
+        domain = LAUNCHD_DOMAINS[domain_id].lower() or DEFAULT_DOMAIN
+        if domain == 'system':
+            return domain
+        return f'{domain}/{os.getuid()}'
+
+    async def load_data_launchctl(self, domain_id=0):
+        labels_col = []
+        paths_col = []
+        states_col = []
+        data_lower = []
         uid = os.getuid()
 
-        domain = LAUNCHD_DOMAINS[domain_id].lower() or DEFAULT_DOMAIN
+        spec = self._domain_spec(domain_id)
 
-        if domain == 'system':
-            user_identifier = ''
-        else:
-            user_identifier = f'/{uid}'
+        gui_processes, err = await self.exec_async(['launchctl', 'print', spec])
+        if err:
+            show_gui_error(f'launchctl print {spec}', err.decode('utf-8', 'replace'))
+
+        services = gui_processes.split(b'services = {\n')[1].split(b'\t}')[0]
 
-        gui_processes = self.exec(['launchctl', 'print', f'{domain}{user_identifier}'])
+        labels = [label.decode() for label in _SVC_LINE_RE.findall(services) if label]
 
-        services = gui_processes.split('services = {\n')[1].split('\t}')[0]
+        # one dumpstate call carries the state of every job, replacing the
+        # per-label `launchctl print` fan-out (one fork/exec each)
+        dump, err = await self._print_cached(('dumpstate', uid), ['launchctl', 'dumpstate'])
+        if err:
+            show_gui_error('launchctl dumpstate', err.decode('utf-8', 'replace'))
+
+        blocks = _parse_dumpstate(dump)
 
-        for line in services.splitlines():
-            label = line.split('\t')[-1]
-            if label:
-                details = self.exec(['launchctl', 'print', f'{domain}{user_identifier}/{label}'])
-                self.jobs[label] = details
-                paths = re.findall('^\s+path =\s(.*$)', details, re.MULTILINE)
-                path = len(paths) and paths[0] or None
+        for label in labels:
+            details = blocks.get(f'{spec}/{label}')
+            if details is None:
+                continue
+            self.jobs[label] = details
+            path, state = extract_path_state(details)
 
-                if path and path.startswith('/'):
-                    states = re.findall('^\s+state =\s(.*$)', details, re.MULTILINE)
-                    state = len(states) and states[0] or ''
-                    data.append([label, path, state])
+            if path and path.startswith('/'):
+                labels_col.append(label)
+                paths_col.append(path)
+                states_col.append(state or '')
+                data_lower.append((label.lower(), path.lower()))
 
-        return data
+        return labels_col, paths_col, states_col, data_lower
 
 
     def createDockWindows(self):
@@ -395,7 +593,7 @@ class MainWindow(QtWidgets.QMainWindow):
                                      | QtCore.Qt.TopDockWidgetArea
                                      | QtCore.Qt.BottomDockWidgetArea)
 
-        self.tableView = CustomTableView(self.data)
+        self.tableView = CustomTableView((self.labels, self.paths, self.states))
         self.tableView.addAction(self.actionOpenFile)
         self.tableView.addAction(self.actionStart)
         self.tableView.addAction(self.actionStop)
@@ -445,8 +643,17 @@ class MainWindow(QtWidgets.QMainWindow):
         :param selected bool
         """
         rowIndex = selected.first().top()
-        row_data = self.data[rowIndex]
-        job_details = self.jobs.get(row_data[0])
+        source = self.tableView.tableModel.source_row(rowIndex)
+        label = self.labels[source]
+        # show the dumpstate block right away, then fetch the full
+        # `launchctl print` detail for just this job in the background
+        self._show_job_details(self.jobs.get(label))
+        self.statusBar().showMessage(self.paths[source])
+        asyncio.ensure_future(self._refresh_job_details(label, source))
+
+    def _show_job_details(self, job_details):
+        if job_details is not None:
+            job_details = job_details.decode('utf-8', 'replace')
         self.textEdit.setHtml(
             f'''
 <pre>
@@ -454,7 +661,30 @@ class MainWindow(QtWidgets.QMainWindow):
 </pre>
 ''')
 
-        self.statusBar().showMessage(row_data[1])
+    async def _refresh_job_details(self, label, source):
+        spec = self._domain_spec()
+        details, err = await self._print_cached(
+            (spec, label), ['launchctl', 'print', f'{spec}/{label}'])
+        if err or not details:
+            return
+        self.jobs[label] = details
+        path, state = extract_path_state(details)
+
+        if source < len(self.labels) and self.labels[source] == label:
+            if path and path != self.paths[source]:
+                self.paths[source] = path
+                # the filter corpus embeds the paths, so it is stale now
+                self._search_blob, self._search_offsets = build_search_index(
+                    [(lbl.lower(), p.lower()) for lbl, p in zip(self.labels, self.paths)])
+            if state:
+                self.states[source] = state
+            model = self.tableView.tableModel
+            view_row = model.view_row(source)
+            if view_row >= 0:
+                model.dataChanged.emit(model.index(view_row, 1), model.index(view_row, 2))
+                selected_indexes = self.tableView.selectionModel().selectedRows()
+                if selected_indexes and selected_indexes[0].row() == view_row:
+                    self._show_job_details(details)
 
     def on_open_linked_file(self, row_index=None):
         if not row_index:
@@ -465,12 +695,13 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 show_gui_error("No message selected", "Please select a message first!")
                 return
-        plist_path = self.data[row_index][1]
+        source = self.tableView.tableModel.source_row(row_index)
+        plist_path = self.paths[source]
 
         if plist_path and Path(plist_path).exists():
             self.start_file(plist_path)
         else:
-            show_gui_error("", f"There is no associated plist file for job {self.data[row_index][0]} "
+            show_gui_error("", f"There is no associated plist file for job {self.labels[source]} "
                                f"\nor invalid path [{plist_path}]")
 
     def start_file(self, filepath):
@@ -519,6 +750,13 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.write_settings()
 
+        if self._helper is not None and self._helper.poll() is None:
+            try:
+                self._helper.stdin.close()
+                self._helper.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self._helper.terminate()
+
         return
         quit_msg = "Are you sure you want to exit the program?"
         reply = QtWidgets.QMessageBox.question(self, 'Message',
@@ -533,9 +771,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
 class CustomTableView(QtWidgets.QTableView):
-    def __init__(self, table_data, *args):
+    def __init__(self, table_columns, *args):
         QtWidgets.QTableView.__init__(self, *args)
-        self.tableModel = CustomTableModel(table_data, self)
+        self.tableModel = CustomTableModel(table_columns, self)
         self.setModel(self.tableModel)
         self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
 
@@ -567,60 +805,58 @@ class CustomTableView(QtWidgets.QTableView):
 class CustomTableModel(QtCore.QAbstractTableModel):
     header_labels = ['Label', 'Path', 'State']
 
-    def __init__(self, datain, parent=None, *args):
+    # class-level copies so data() skips the QtCore.Qt attribute lookups on every call
+    _DISPLAY_ROLE = QtCore.Qt.DisplayRole
+    _TEXT_ALIGNMENT_ROLE = QtCore.Qt.TextAlignmentRole
+    _ALIGNMENT = int(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+
+    def __init__(self, columns, parent=None, *args):
         QtCore.QAbstractTableModel.__init__(self, parent, *args)
-        self.arraydata = datain
+        # column-major storage: (labels, paths, states) parallel lists, shared
+        # with MainWindow; _rows maps visible rows to indices into the columns
+        self._cols = tuple(columns)
+        self._rows = list(range(len(self._cols[0])))
         self.last_saved_sort_column = None
         self.last_saved_sort_order = None
 
     def rowCount(self, parent):
-        return len(self.arraydata)
+        return len(self._rows)
 
     def columnCount(self, parent):
         return len(self.header_labels)
 
+    def source_row(self, view_row):
+        """Index into the column arrays for the given visible row."""
+        return self._rows[view_row]
+
+    def view_row(self, source_row):
+        """Visible row for the given column-array index, or -1 if filtered out."""
+        try:
+            return self._rows.index(source_row)
+        except ValueError:
+            return -1
+
     def data(self, qModelIndex, role):
-        # index is a QModelIndex type
-        if not qModelIndex.isValid():
-            return QtCore.QVariant()
-        elif role != QtCore.Qt.DisplayRole:
-            return QtCore.QVariant()
-        elif role == QtCore.Qt.TextAlignmentRole:
-            return QtCore.Qt.AlignLeft
-        elif qModelIndex.isValid() and role == QtCore.Qt.DecorationRole:
-            row = qModelIndex.row()
-            column = qModelIndex.column()
-            value = None
+        # Qt queries many roles per cell repaint: answer DisplayRole first,
+        # bail out immediately for everything unhandled
+        if role == self._DISPLAY_ROLE:
             try:
-                value = self.arraydata[row][column]
+                return self._cols[qModelIndex.column()][self._rows[qModelIndex.row()]]
             except IndexError:
-                return
-        elif qModelIndex.isValid() and role == QtCore.Qt.DisplayRole:
-            row = qModelIndex.row()
-            column = qModelIndex.column()
-            try:
-                value = self.arraydata[row][column]
-            except IndexError:
-                return
-            return value
-
-        return QtCore.QVariant(self.arraydata[qModelIndex.row()][qModelIndex.column()])
+                return None
+        if role == self._TEXT_ALIGNMENT_ROLE:
+            return self._ALIGNMENT
+        return None
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         if role == QtCore.Qt.EditRole:
-            self.arraydata[index.row()] = value
+            source = self._rows[index.row()]
+            for col, cell in zip(self._cols, value):
+                col[source] = cell
             self.dataChanged.emit(index, index)
             return True
         return False
 
-    def sendSignalLayoutAboutToBeChanged(self):
-        self.layoutAboutToBeChanged.emit()
-        self.beginResetModel()
-
-    def sendSignalLayoutChanged(self):
-        self.endResetModel()
-        self.layoutChanged.emit()
-
     def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
         if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
             return self.header_labels[section]
@@ -628,20 +864,60 @@ class CustomTableModel(QtCore.QAbstractTableModel):
 
     def insertRows(self, position, item, parent=QtCore.QModelIndex()):
 
-        self.beginInsertRows(QtCore.QModelIndex(), len(self.arraydata), len(self.arraydata) + 1)
-        self.arraydata.append(item)  # Item must be an array
+        self.beginInsertRows(QtCore.QModelIndex(), len(self._rows), len(self._rows) + 1)
+        for col, cell in zip(self._cols, item):  # Item must be an array
+            col.append(cell)
+        self._rows.append(len(self._cols[0]) - 1)
         self.endInsertRows()
         return True
 
+    def replace_columns(self, labels, paths, states):
+        """Full reload: swap in the new column arrays and show every row."""
+        self.beginResetModel()
+        self._cols = (labels, paths, states)
+        self._rows = list(range(len(labels)))
+        self.endResetModel()
+
+    def set_visible(self, indices):
+        """
+        Update the visible-row permutation in place, emitting remove/insert
+        ranges for the rows that actually changed (diffed by label) instead of
+        a full model reset, so QModelIndex caches and the selection survive
+        filtering.
+        """
+        labels = self._cols[0]
+        matcher = difflib.SequenceMatcher(a=[labels[i] for i in self._rows],
+                                          b=[labels[i] for i in indices],
+                                          autojunk=False)
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == 'equal':
+                continue
+            if tag in ('delete', 'replace'):
+                self.beginRemoveRows(QtCore.QModelIndex(), i1, i2 - 1)
+                del self._rows[i1:i2]
+                self.endRemoveRows()
+            if tag in ('insert', 'replace'):
+                self.beginInsertRows(QtCore.QModelIndex(), i1, i1 + (j2 - j1) - 1)
+                self._rows[i1:i1] = indices[j1:j2]
+                self.endInsertRows()
+
     def sort(self, ncol, order):
         """
         Sort table by given column number.
         """
-        self.sendSignalLayoutAboutToBeChanged()
+        self.layoutAboutToBeChanged.emit()
+
+        persistent = self.persistentIndexList()
+        persistent_sources = [self._rows[idx.row()] for idx in persistent]
+        self._rows.sort(key=self._cols[ncol].__getitem__,
+                        reverse=order == QtCore.Qt.DescendingOrder)
+        new_positions = {source: i for i, source in enumerate(self._rows)}
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(new_positions[source], idx.column())
+             for idx, source in zip(persistent, persistent_sources)])
 
-        sorted_data = sorted(self.arraydata, key=operator.itemgetter(ncol), reverse=order)
-        self.arraydata[:] = sorted_data[:]
-        self.sendSignalLayoutChanged()
+        self.layoutChanged.emit()
         self.last_saved_sort_column = ncol
         self.last_saved_sort_order = order
 
@@ -654,11 +930,18 @@ def show_gui_error(msg, error_text=''):
 
 
 def main():
+    _raise_qos()
     app = QtWidgets.QApplication(sys.argv)
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
     mainWin = MainWindow()
     mainWin.show()
     mainWin.raise_()
-    sys.exit(app.exec_())
+    with loop:
+        # the asyncSlot wrapper schedules the coroutine itself and returns a
+        # Task, which create_task would reject
+        mainWin.on_refresh()
+        sys.exit(loop.run_forever())
 
 
 if __name__ == '__main__':